@@ -0,0 +1,78 @@
+"""카드 메모리 사용량 벤치마크 (dict vs Card 모델, RSS 기준)
+
+    python bench_memory.py                # 100,000 / 1,000,000 카드
+    python bench_memory.py 50000 200000   # 원하는 개수 지정
+
+측정은 개수/모델마다 별도 프로세스에서 실행해 서로 영향을 주지 않게 한다.
+"""
+import json
+import subprocess
+import sys
+import uuid
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+USER_COUNT = 1000
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def make_card_json(i):
+    # json.loads로 매번 새로 파싱해야 실제 cards.json을 읽을 때처럼 문자열이 카드마다 따로 생긴다
+    user = i % USER_COUNT
+    return json.dumps({
+        'id': str(uuid.UUID(int=i)),
+        'user_id': str(uuid.UUID(int=user + 1 << 64)),
+        'username': f'user{user}',
+        'title': f'할일 카드 {i}',
+        'subtitle': '',
+        'contents': [
+            {'text': '카드 구현', 'completed': True},
+            {'text': '로그인 구현', 'completed': i % 2 == 0},
+            {'text': '회원가입 구현', 'completed': False}
+        ],
+        'public': i % 3 == 0,
+        'deadline': None,
+        'createdAt': 1760665199 + i,
+        'updatedAt': 1760665235 + i,
+        'rev': i + 1,
+        'version': 1
+    }, ensure_ascii=False)
+
+def run_child(model, count):
+    from app import Card
+    base = rss_kb()
+    cards = []
+    for i in range(count):
+        data = json.loads(make_card_json(i))
+        if model == 'card':
+            card = Card.from_dict(data)
+            assert i or card.to_dict() == data  # 무손실 변환 확인
+            cards.append(card)
+        else:
+            cards.append(data)
+    print(json.dumps({'model': model, 'count': count, 'rss_kb': rss_kb() - base}))
+
+def main(sizes):
+    print(f"{'cards':>10} {'dict (MB)':>12} {'Card (MB)':>12} {'ratio':>8}")
+    for count in sizes:
+        result = {}
+        for model in ('dict', 'card'):
+            out = subprocess.run([sys.executable, __file__, '--child', model, str(count)],
+                                 check=True, capture_output=True, text=True).stdout
+            result[model] = json.loads(out.strip().splitlines()[-1])['rss_kb'] / 1024
+        print(f"{count:>10,} {result['dict']:>12.1f} {result['card']:>12.1f} "
+              f"{result['card'] / result['dict']:>8.2f}")
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,70 @@
+"""앱 시작 시간 벤치마크 (cards.json 파싱 vs pickle 스냅샷)
+
+    python bench_startup.py                # 10,000 / 100,000 / 1,000,000 카드
+    python bench_startup.py 50000 200000   # 원하는 개수 지정
+
+개수마다 임시 DATA_DIR에 cards.json을 만들고, 별도 프로세스에서
+import → create_app() → 카드를 다 읽을 때(readiness 200)까지의 시간을 잰다.
+    import/create : 모듈 import와 create_app()이 돌아올 때까지 (요청을 받기 시작하는 시점)
+    JSON          : 스냅샷 없이 cards.json을 파싱해서 준비될 때까지
+    snapshot      : 이전 실행이 남긴 cards.snapshot을 읽어서 준비될 때까지
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_memory import make_card_json
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+def write_cards(data_dir, count):
+    with open(os.path.join(data_dir, 'cards.json'), 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(count):
+            f.write(',\n' if i else '\n')
+            f.write(make_card_json(i))
+        f.write('\n]')
+
+def run_child(data_dir, snapshot):
+    started = time.perf_counter()
+    from app import create_app
+    app = create_app({'DATA_DIR': data_dir, 'CARD_SNAPSHOT': snapshot, 'SECRET_KEY': 'bench'})
+    created = time.perf_counter()
+    state = app.extensions['todolist']
+    state.ready.wait()
+    ready = time.perf_counter()
+    print(json.dumps({'create': created - started, 'ready': ready - started, 'cards': len(state.cards.all())}))
+
+def measure(data_dir, snapshot):
+    out = subprocess.run([sys.executable, __file__, '--child', data_dir, str(int(snapshot))],
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main(sizes):
+    print(f"{'cards':>10} {'import/create':>14} {'JSON (s)':>10} {'snapshot (s)':>13} {'speedup':>8} "
+          f"{'JSON (MB)':>10} {'snapshot (MB)':>14}")
+    for count in sizes:
+        data_dir = tempfile.mkdtemp(prefix='todolist-bench-')
+        try:
+            write_cards(data_dir, count)
+            from_json = measure(data_dir, snapshot=False)
+            measure(data_dir, snapshot=True)  # 처음 시작: JSON을 읽고 스냅샷을 남긴다
+            from_snapshot = measure(data_dir, snapshot=True)
+            assert from_json['cards'] == from_snapshot['cards'] == count
+            json_mb = os.path.getsize(os.path.join(data_dir, 'cards.json')) / 2**20
+            snapshot_mb = os.path.getsize(os.path.join(data_dir, 'cards.snapshot')) / 2**20
+            print(f"{count:>10,} {from_json['create'] * 1000:>12.0f}ms {from_json['ready']:>10.2f} "
+                  f"{from_snapshot['ready']:>13.2f} {from_json['ready'] / from_snapshot['ready']:>8.1f} "
+                  f"{json_mb:>10.1f} {snapshot_mb:>14.1f}")
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3] == '1')
+    else:
+        main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,126 @@
+"""배포용 실행 스크립트 (개발 서버 대신 사용)
+
+    python serve.py                                   # threaded: gunicorn gthread 워커 (Windows에서는 waitress)
+    python serve.py --server gevent                   # gevent 워커 (SSE 연결이 많을 때)
+    python serve.py --server asgi --threads 32        # uvicorn + WSGI→ASGI 어댑터
+    python serve.py --threads 16 --port 8000
+
+필요한 패키지는 모드별로 다르다.
+    threaded : gunicorn (없으면 waitress)
+    gevent   : gunicorn, gevent
+    asgi     : uvicorn, a2wsgi
+
+카드 데이터는 프로세스 메모리에 올려 두고 쓰기와 저장소 버전도 프로세스 안에서만 관리하므로
+한 DATA_DIR은 한 프로세스만 쓸 수 있다 (워커마다 카드를 따로 들고 있으면 서로의 저장을 덮어쓰고
+/api/cards/changes의 버전도 어긋난다). 그래서 어느 모드든 워커 프로세스는 하나만 띄우고,
+동시 요청은 --threads(또는 gevent 연결 수)로 늘린다.
+서버가 카드를 쓰기 시작하면 같은 DATA_DIR에 대한 flask import-data/archive-cards 명령은 실패하므로,
+실행 중에는 /api/admin/import를 쓰고 아카이브는 TODOLIST_ARCHIVE_AFTER_DAYS로 서버에 맡긴다.
+SSE 연결은 threaded 모드에서 스레드를 하나씩 계속 차지한다는 점을 감안해서 --threads를 정한다.
+
+앱은 프로세스(gunicorn 워커)마다 create_app()으로 만든다. 카드/유저 데이터는 백그라운드에서
+읽고, 다 읽기 전까지 /healthz/ready는 503을 돌려준다.
+
+SIGTERM을 받으면 app.shutdown()으로 readiness를 503으로 바꾸고, SSE 스트림을 닫고,
+저장되지 않은 카드 변경을 파일에 쓴 뒤 진행 중인 요청이 끝나기를 기다렸다가 종료한다.
+"""
+import argparse
+import os
+import signal
+
+from app import create_app, shutdown
+
+def default_threads():
+    return min(32, (os.cpu_count() or 1) * 4)
+
+def chain_sigterm(app, extra_handler=None):
+    """현재 SIGTERM 핸들러 앞에 app.shutdown()을 끼워 넣는다."""
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handler(signum, frame):
+        shutdown(app)
+        if extra_handler:
+            extra_handler()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, handler)
+
+def run_gunicorn(args, worker_class):
+    from gunicorn.app.base import BaseApplication
+
+    class TodoListApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': f'{args.host}:{args.port}',
+                'workers': 1,  # WEB_CONCURRENCY 환경 변수가 있어도 워커는 하나만 (모듈 docstring 참고)
+                'worker_class': worker_class,
+                'threads': args.threads,
+                'worker_connections': args.connections,
+                'graceful_timeout': args.graceful_timeout,
+                'timeout': 0 if worker_class == 'gevent' else 120,
+                # gunicorn이 워커의 시그널 핸들러를 설치한 뒤에 shutdown()을 끼워 넣는다
+                'post_worker_init': lambda worker: chain_sigterm(worker.wsgi),
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return create_app()  # 워커 프로세스 안에서 호출된다
+
+    TodoListApplication().run()
+
+def run_waitress(args):
+    from waitress import create_server
+    app = create_app()
+    server = create_server(app, host=args.host, port=args.port, threads=args.threads)
+    chain_sigterm(app, server.close)
+    try:
+        server.run()
+    except SystemExit:
+        pass
+    finally:
+        shutdown(app)
+
+def run_asgi(args):
+    import uvicorn
+    # asgiref의 WsgiToAsgi는 모든 요청을 한 스레드에서 실행해서 SSE 하나가 나머지를 막는다.
+    # a2wsgi는 --threads 크기의 스레드 풀에서 요청을 나눠 실행한다.
+    from a2wsgi import WSGIMiddleware
+    app = create_app()
+
+    class Server(uvicorn.Server):
+        def handle_exit(self, sig, frame):
+            shutdown(app)
+            super().handle_exit(sig, frame)
+
+    config = uvicorn.Config(WSGIMiddleware(app, workers=args.threads), host=args.host, port=args.port, lifespan='off',
+                            timeout_graceful_shutdown=args.graceful_timeout)
+    Server(config).run()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='TodoList 배포용 서버 실행')
+    parser.add_argument('--server', choices=('threaded', 'gevent', 'asgi'), default=os.environ.get('TODOLIST_SERVER', 'threaded'))
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('TODOLIST_THREADS', default_threads())))
+    parser.add_argument('--connections', type=int, default=1000, help='gevent 워커당 최대 동시 연결 수')
+    parser.add_argument('--graceful-timeout', type=int, default=30, help='종료 시 진행 중인 요청을 기다리는 시간(초)')
+    args = parser.parse_args(argv)
+
+    if args.server == 'asgi':
+        run_asgi(args)
+    elif args.server == 'gevent':
+        run_gunicorn(args, 'gevent')
+    else:
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:  # Windows 등 gunicorn을 쓸 수 없는 환경
+            run_waitress(args)
+        else:
+            run_gunicorn(args, 'gthread')
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,7 @@ if (logoutLink) {
     e.preventDefault();
     try {
       await fetch('/logout', { method: 'POST', credentials: 'same-origin' });
+      await CardCache.clear();
     } finally {
       location.href = '/';
     }
@@ -101,38 +102,6 @@ function sanitizeText(text) {
     .trim();
 }
 
-async function api(url, { method='GET', body, headers, timeout=10000, signal } = {}) {
-  const controller = signal || new AbortController();
-  const timeoutId = setTimeout(() => controller.abort(), timeout);
-  
-  try {
-    const res = await fetch(url, {
-      method,
-      credentials: 'same-origin',
-      headers: body ? { 'Content-Type': 'application/json', ...(headers||{}) } : headers,
-      body: body ? JSON.stringify(body) : undefined,
-      signal: controller.signal
-    });
-    
-    clearTimeout(timeoutId);
-    
-    const ct = res.headers.get('content-type') || '';
-    const data = ct.includes('application/json') ? await res.json() : await res.text();
-    
-    if (!res.ok) {
-      const msg = (data && (data.error || data.message)) || `HTTP ${res.status}`;
-      throw new Error(msg);
-    }
-    return data;
-  } catch (err) {
-    clearTimeout(timeoutId);
-    if (err.name === 'AbortError') {
-      throw new Error('요청 시간이 초과되었습니다. 다시 시도해주세요.');
-    }
-    throw err;
-  }
-}
-
 function showMessage(msg, type='info') {
   let el = document.getElementById('toastMsg');
   if (!el) {
@@ -256,9 +225,14 @@ async function loadCards() {
   isLoadingCards = true;
   currentLoadRequest = new AbortController();
   
-  const loadingEl = showLoading('카드를 불러오는 중...');
   try {
-    otherCards = await api('/api/cards?scope=others', { 
+    // 저장된 카드부터 바로 그리고, 서버에서는 바뀐 부분만 받아온다
+    if (otherCards.length === 0) {
+      otherCards = await CardCache.getAll('others');
+      if (otherCards.length > 0) renderCards();
+    }
+    if (otherCards.length === 0) showLoading('카드를 불러오는 중...');
+    otherCards = await CardCache.sync('others', { 
       signal: currentLoadRequest.signal,
       timeout: 5000 
     });
@@ -269,6 +243,10 @@ async function loadCards() {
       return;
     }
     console.error('카드 로딩 오류:', err);
+    if (err.offline && otherCards.length > 0) {
+      showMessage('오프라인 상태입니다. 저장된 카드를 표시합니다.', 'error');
+      return;
+    }
     showMessage(`카드 로딩 실패: ${err.message}`, 'error');
     otherCards = [];
     renderCards();
@@ -27,6 +27,7 @@ if (logoutLink) {
     e.preventDefault();
     try {
       await fetch('/logout', { method: 'POST', credentials: 'same-origin' });
+      await CardCache.clear();
     } finally {
       location.href = '/';
     }
@@ -141,38 +142,6 @@ function setDatetimeFields(fieldPrefix, timestamp) {
   document.getElementById(fieldPrefix + '_minute').value = date.getMinutes();
 }
 
-async function api(url, { method='GET', body, headers, timeout=10000, signal } = {}) {
-  const controller = signal || new AbortController();
-  const timeoutId = setTimeout(() => controller.abort(), timeout);
-  
-  try {
-    const res = await fetch(url, {
-      method,
-      credentials: 'same-origin',
-      headers: body ? { 'Content-Type': 'application/json', ...(headers||{}) } : headers,
-      body: body ? JSON.stringify(body) : undefined,
-      signal: controller.signal
-    });
-    
-    clearTimeout(timeoutId);
-    
-    const ct = res.headers.get('content-type') || '';
-    const data = ct.includes('application/json') ? await res.json() : await res.text();
-    
-    if (!res.ok) {
-      const msg = (data && (data.error || data.message)) || `HTTP ${res.status}`;
-      throw new Error(msg);
-    }
-    return data;
-  } catch (err) {
-    clearTimeout(timeoutId);
-    if (err.name === 'AbortError') {
-      throw new Error('요청 시간이 초과되었습니다. 다시 시도해주세요.');
-    }
-    throw err;
-  }
-}
-
 function showMessage(msg, type='info') {
   let el = document.getElementById('toastMsg');
   if (!el) {
@@ -311,9 +280,11 @@ async function loadCards() {
   isLoadingCards = true;
   currentLoadRequest = new AbortController();
   
-  const loadingEl = showLoading('카드를 불러오는 중...');
   try {
-    myCards = await api('/api/cards?scope=my', { 
+    // 저장된 카드부터 바로 그리고, 서버에서는 바뀐 부분만 받아온다
+    await renderCachedCards();
+    if (myCards.length === 0) showLoading('카드를 불러오는 중...');
+    myCards = await CardCache.sync('my', { 
       signal: currentLoadRequest.signal,
       timeout: 5000 
     });
@@ -324,6 +295,10 @@ async function loadCards() {
       return;
     }
     console.error('카드 로딩 오류:', err);
+    if (err.offline && myCards.length > 0) {
+      showMessage('오프라인 상태입니다. 변경 사항은 연결되면 저장됩니다.', 'error');
+      return;
+    }
     showMessage(`카드 로딩 실패: ${err.message}`, 'error');
     myCards = [];
     renderCards();
@@ -334,6 +309,48 @@ async function loadCards() {
   }
 }
 
+async function renderCachedCards() {
+  myCards = await CardCache.getAll('my');
+  renderCards();
+}
+
+// 내 카드 변경: 오프라인이면 로컬에 먼저 반영하고 연결되면 다시 보낸다
+async function mutateCard(method, url, body) {
+  const result = await CardCache.mutate({ method, url, body });
+  if (result.queued) {
+    await renderCachedCards();
+  } else {
+    await loadCards();
+  }
+  return result;
+}
+
+// 오프라인에서 한 수정이 다른 곳의 수정과 부딪히면 어느 쪽을 남길지 묻는다
+let resolvingConflicts = false;
+async function resolveConflicts() {
+  if (resolvingConflicts) return;
+  resolvingConflicts = true;
+  try {
+    let conflicts;
+    while ((conflicts = await CardCache.getConflicts()).length) {
+      const entry = conflicts[0];
+      const title = (entry.body && entry.body.title) || (entry.conflict.card && entry.conflict.card.title) || '';
+      const keepMine = confirm(`'${title}' 카드가 다른 곳에서 먼저 수정되어 오프라인에서 한 변경을 저장하지 못했습니다.\n` +
+        '확인: 내 변경으로 덮어쓰기 / 취소: 다른 곳에서 수정한 내용 유지');
+      await CardCache.resolveConflict(entry.seq, keepMine);
+    }
+  } finally {
+    resolvingConflicts = false;
+  }
+  await loadCards();
+}
+
+CardCache.onReplay(result => {
+  if (result.conflicts.length) resolveConflicts();
+  else loadCards();
+});
+CardCache.getConflicts().then(conflicts => { if (conflicts.length) resolveConflicts(); });
+
 function renderCards() {
   if (myCards.length === 0) {
     container.innerHTML = '<div class="text-center text-muted">아직 할일이 없습니다. 새로운 할일을 추가해보세요!</div>';
@@ -418,10 +435,7 @@ document.getElementById('saveAdd')?.addEventListener('click', async () => {
   try {
     const body = { title, subtitle, contents: [], public: isPublic };
     if (deadline) body.deadline = deadline;
-    await api('/api/cards', {
-      method: 'POST',
-      body
-    });
+    const result = await mutateCard('POST', '/api/cards', body);
     
     // 폼 초기화
     document.getElementById('addTodoTitle').value = '';
@@ -430,9 +444,6 @@ document.getElementById('saveAdd')?.addEventListener('click', async () => {
     document.getElementById('addTodoVisibility').value = 'public';
     addModal.style.display = 'none';
     
-    // 즉시 로컬 갱신
-    await loadCards();
-    
     // 다른 페이지들에게 브로드캐스트 (강제 갱신)
     if (typeof BroadcastChannel !== 'undefined') {
       const channel = new BroadcastChannel('todo-updates');
@@ -440,7 +451,7 @@ document.getElementById('saveAdd')?.addEventListener('click', async () => {
       channel.close();
     }
     
-    showMessage('카드가 생성되었습니다.', 'success');
+    showMessage(result.queued ? '오프라인 상태입니다. 연결되면 카드가 저장됩니다.' : '카드가 생성되었습니다.', 'success');
   } catch(err) {
     console.error('카드 생성 오류:', err);
     showMessage(`카드 생성 실패: ${err.message}`, 'error');
@@ -466,8 +477,7 @@ container?.addEventListener('click', async (e) => {
   if (action === 'delete') {
     if (!confirm('정말로 이 카드를 삭제하시겠습니까?')) return;
     try {
-      await api(`/api/cards/${id}`, { method:'DELETE' });
-      await loadCards();
+      await mutateCard('DELETE', `/api/cards/${id}`);
       showMessage('카드를 삭제했습니다.', 'success');
     } catch(err) {
       showMessage(`카드 삭제 실패: ${err.message}`, 'error');
@@ -524,10 +534,10 @@ document.getElementById('closeEdit')?.addEventListener('click', () => {
 document.getElementById('deleteEdit')?.addEventListener('click', async () => {
   if (!editingCardId || !confirm('정말로 이 카드를 삭제하시겠습니까?')) return;
   try {
-    await api(`/api/cards/${editingCardId}`, { method: 'DELETE' });
+    const cardId = editingCardId;
     editModal.style.display = 'none';
     editingCardId = null;
-    await loadCards();
+    await mutateCard('DELETE', `/api/cards/${cardId}`);
     showMessage('카드를 삭제했습니다.', 'success');
   } catch(err) {
     showMessage(`카드 삭제 실패: ${err.message}`, 'error');
@@ -610,20 +620,19 @@ document.getElementById('saveEdit')?.addEventListener('click', async () => {
   }).filter(c => c.text.trim());
 
   try {
-    const body = { title, subtitle, contents, public: isPublic };
+    // 수정을 시작할 때의 버전을 같이 보내서, 그 사이 다른 곳에서 바뀌었으면 409로 거절되게 한다
+    const editingCard = myCards.find(c => c.id === editingCardId);
+    const body = { title, subtitle, contents, public: isPublic, version: editingCard ? editingCard.version : undefined };
     if (deadline) body.deadline = deadline;
     else body.deadline = '';
     
-    await api(`/api/cards/${editingCardId}`, {
-      method: 'PUT',
-      body
-    });
+    const result = await mutateCard('PUT', `/api/cards/${editingCardId}`, body);
     editModal.style.display = 'none';
     editingCardId = null;
-    await loadCards();
-    showMessage('카드가 수정되었습니다.', 'success');
+    showMessage(result.queued ? '오프라인 상태입니다. 연결되면 수정 내용이 저장됩니다.' : '카드가 수정되었습니다.', 'success');
   } catch(err) {
     showMessage(`카드 수정 실패: ${err.message}`, 'error');
+    if (err.status === 409) await renderCachedCards();
   }
 });
 
@@ -1,4 +1,5 @@
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for, Response, stream_with_context
+from flask import Blueprint, Flask, current_app, render_template, jsonify, request, session, redirect, url_for, Response, stream_with_context
+from werkzeug.local import LocalProxy
 import hashlib
 import os
 import json
@@ -9,20 +10,75 @@ from datetime import datetime, timedelta
 from threading import Lock
 import secrets
 import uuid
+import gzip
+import io
+import itertools
+import click
+import sys
+import atexit
+import contextlib
+import weakref
+import logging
+import pickle
+import gc
+from dataclasses import dataclass, replace
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
-app = Flask(__name__)
+# 라우트와 CLI 명령은 블루프린트에 모아 두고 create_app()에서 앱에 붙인다.
+# 모듈을 import할 때는 아무 파일도 만들거나 읽지 않는다.
+bp = Blueprint('todolist', __name__, cli_group=None)
+logger = logging.getLogger(__name__)
 
 # ---------------- 기본 설정 ----------------
-app.secret_key = secrets.token_hex(32)
-app.config['SESSION_COOKIE_NAME'] = 'todolist_session'
-app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=30)
+# create_app(config)에 넘긴 값이 이 기본값을 덮어쓴다
+DEFAULT_CONFIG = {
+    # 여러 워커/재시작 간에 세션이 유지되도록 고정된 키를 사용 (없으면 DATA_DIR/secret_key에 한 번 생성)
+    'SECRET_KEY': os.environ.get('TODOLIST_SECRET_KEY'),
+    'SESSION_COOKIE_NAME': 'todolist_session',
+    'PERMANENT_SESSION_LIFETIME': timedelta(days=30),
+    'DATA_DIR': os.environ.get('TODOLIST_DATA_DIR', 'data'),
+    # 모든 할일이 완료된 뒤 이 기간(일) 동안 수정되지 않은 카드는 아카이브로 이동 (0이면 비활성화)
+    # 아카이브된 카드는 화면에서 보이지 않고 /api/cards/archive로만 볼 수 있으므로 기본값은 비활성화
+    'ARCHIVE_AFTER_DAYS': int(os.environ.get('TODOLIST_ARCHIVE_AFTER_DAYS', 0)),
+    'ARCHIVE_CHECK_INTERVAL': 3600,  # 백그라운드 아카이브 검사 주기(초)
+    'ARCHIVE_PAGE_SIZE': 20,
+    'IMPORT_CHUNK_SIZE': 1000,
+    'SYNC_TOMBSTONE_LIMIT': 10000,  # 동기화용으로 보관할 삭제 기록 수
+    # 카드 변경을 모아서 저장하는 간격(초). 0보다 크면 파일에 쓰기 전에 응답하고, 0이면 요청마다 바로 저장한 뒤 응답한다
+    'WRITE_BEHIND_DELAY': 0.2,
+    # 내보내기/가져오기 API용 관리자 토큰 (X-Admin-Token 헤더, 없으면 비활성화)
+    'ADMIN_TOKEN': os.environ.get('TODOLIST_ADMIN_TOKEN'),
+    'WARM_UP': True,  # 앱을 만들자마자 백그라운드 스레드에서 카드/유저를 미리 읽어 둔다
+    'CARD_SNAPSHOT': True,  # cards.json과 같은 내용의 pickle 스냅샷을 남겨 두고 다음 시작 때 그걸 읽는다
+}
 
 # ---------------- JSON 기반 로컬 데이터베이스 ----------------
-DATA_DIR = "data"
-os.makedirs(DATA_DIR, exist_ok=True)
+def data_path(filename):
+    """현재 앱의 DATA_DIR 안의 경로"""
+    return os.path.join(current_app.config['DATA_DIR'], filename)
 
-def load_json(filename):
-    path = os.path.join(DATA_DIR, filename)
+def load_or_create_secret_key(data_dir, filename="secret_key"):
+    path = os.path.join(data_dir, filename)
+    if not os.path.exists(path):
+        # 임시 파일에 쓴 뒤 link로 올려서, 여러 워커가 동시에 시작해도 키는 하나만 만들어진다
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+    with open(path, "r") as f:
+        return f.read().strip()
+
+def load_json(path):
     if not os.path.exists(path):
         return None  # 파일이 없으면 None 반환
     with open(path, "r", encoding="utf-8") as f:
@@ -31,10 +87,47 @@ def load_json(filename):
         except json.JSONDecodeError:
             return None  # 파일이 손상되었으면 None 반환
 
-def save_json(filename, data):
-    path = os.path.join(DATA_DIR, filename)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def save_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)  # 쓰는 도중 중단돼도 기존 파일이 깨지지 않도록 교체
+    except Exception:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+def file_stamp(path):
+    """파일이 바뀌었는지 확인하기 위한 (mtime, 크기). 파일이 없으면 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def try_lock_file(f):
+    """열린 파일 f에 배타적 잠금을 건다. 이미 다른 곳(다른 프로세스, 같은 프로세스의 다른 핸들)이 잡고 있으면 False"""
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+@contextlib.contextmanager
+def gc_paused():
+    """객체를 대량으로 만드는 동안 순환 GC를 멈춘다. 켜 두면 카드 수에 비례해 GC가 반복 실행돼서 읽기가 몇 배 느려진다."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 def datetime_local_to_timestamp(datetime_input):
     if not datetime_input:
@@ -50,17 +143,55 @@ def datetime_local_to_timestamp(datetime_input):
     return None
 
 # ---------------- 유저 관리 ----------------
+class UserStore:
+    """users.json을 메모리에 올려 두고 아이디로 바로 찾는 저장소.
+    다른 프로세스가 파일을 바꾸면(mtime/크기 변경) 다음 접근 때 다시 읽는다."""
+
+    def __init__(self, data_dir, filename="users.json"):
+        self.path = os.path.join(data_dir, filename)
+        self.lock = Lock()  # users.json 읽기-수정-저장 직렬화
+        self._load_lock = Lock()
+        self._users = []
+        self._by_name = {}
+        self._stamp = None
+
+    def _ensure_loaded(self):
+        stamp = file_stamp(self.path)
+        if stamp is not None and stamp == self._stamp:
+            return
+        with self._load_lock:
+            stamp = file_stamp(self.path)
+            if stamp is not None and stamp == self._stamp:
+                return
+            self._set(load_json(self.path) or [], stamp)
+
+    def _set(self, users, stamp):
+        self._users = users
+        self._by_name = {u["username"]: u for u in users}
+        self._stamp = stamp
+
+    def all(self):
+        self._ensure_loaded()
+        return list(self._users)
+
+    def find(self, username):
+        self._ensure_loaded()
+        return self._by_name.get(username)
+
+    def save(self, users):
+        """users 목록으로 users.json을 덮어쓴다 (self.lock을 잡은 상태에서 호출)"""
+        users = list(users)
+        save_json(self.path, users)
+        with self._load_lock:
+            self._set(users, file_stamp(self.path))
+
 def find_user(username):
-    users = load_json("users.json")
-    for user in users:
-        if user["username"] == username:
-            return user
-    return None
+    return user_store.find(username)
 
-@app.route('/', methods=['GET', 'POST'])
+@bp.route('/', methods=['GET', 'POST'])
 def Login():
     if 'username' in session:
-        return redirect(url_for('home'))
+        return redirect(url_for('.home'))
 
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -75,7 +206,7 @@ def Login():
         return jsonify({'result': 'success', 'message': '로그인 성공'})
     return render_template('login.html')
 
-@app.route('/check_username', methods=['POST'])
+@bp.route('/check_username', methods=['POST'])
 def check_username():
     username = request.form.get('username', '').strip()
     if not username:
@@ -84,13 +215,12 @@ def check_username():
     if len(username) < 3 or len(username) > 20:
         return jsonify({'result': 'fail', 'message': '아이디는 3~20자여야 합니다.'})
         
-    users = load_json("users.json")
-    if any(u["username"] == username for u in users):
+    if find_user(username):
         return jsonify({'result': 'fail', 'message': '이미 존재하는 아이디입니다.'})
-        
+
     return jsonify({'result': 'success', 'message': '사용 가능한 아이디입니다.'})
 
-@app.route('/register', methods=['GET', 'POST'])
+@bp.route('/register', methods=['GET', 'POST'])
 def Register():
     if request.method == 'POST':
         username = request.form.get('reg-username', '').strip()
@@ -100,43 +230,715 @@ def Register():
             return jsonify({'result': 'fail', 'message': '모든 필드를 입력하세요.'})
         if password != password_confirm:
             return jsonify({'result': 'fail', 'message': '비밀번호가 일치하지 않습니다.'})
-        users = load_json("users.json")
-        if any(u["username"] == username for u in users):
-            return jsonify({'result': 'fail', 'message': '이미 존재하는 아이디입니다.'})
-        new_user = {
-            "id": str(uuid.uuid4()),
-            "username": username,
-            "password": hashlib.sha256(password.encode()).hexdigest()
-        }
-        users.append(new_user)
-        save_json("users.json", users)
+        with user_store.lock:
+            if find_user(username):
+                return jsonify({'result': 'fail', 'message': '이미 존재하는 아이디입니다.'})
+            new_user = {
+                "id": str(uuid.uuid4()),
+                "username": username,
+                "password": hashlib.sha256(password.encode()).hexdigest()
+            }
+            users = user_store.all()
+            users.append(new_user)
+            user_store.save(users)
         return jsonify({'result': 'success', 'message': '회원가입 성공'})
     register_data = {
         'title': 'Todo List'
     }
     return render_template('register.html', register_data=register_data)
 
-@app.route('/logout', methods=['POST'])
+@bp.route('/logout', methods=['POST'])
 def logout():
     session.clear()
     return jsonify({'result': 'success', 'message': '로그아웃 되었습니다.'})
 
-# ---------------- 카드 관리 ----------------
-def get_cards():
-    cards = load_json("cards.json")
-    if cards is None:  # load_json이 None을 반환하면 (파일이 없는 경우)
-        cards = []     # 빈 배열로 초기화
-        save_cards(cards)  # 파일 생성
-    return cards
+# ---------------- 카드 모델 (메모리 절약형) ----------------
+# 카드를 dict 대신 __slots__ 데이터클래스로 보관한다.
+# user_id/username은 intern 해서 같은 유저의 카드끼리 하나의 문자열을 공유하고,
+# 할일 목록은 텍스트 튜플과 완료 여부 bytes의 병렬 배열로 저장한다.
+CARD_FIELDS = ('id', 'user_id', 'username', 'title', 'subtitle', 'contents',
+               'public', 'deadline', 'createdAt', 'updatedAt', 'rev', 'version')
+
+def _pack_contents(contents):
+    """할일 목록을 (텍스트 튜플, 완료 여부 bytes)로 변환. 표준 형태가 아니면 None 반환"""
+    texts, done = [], bytearray()
+    for item in contents:
+        if (not isinstance(item, dict) or item.keys() != {'text', 'completed'}
+                or not isinstance(item['text'], str) or not isinstance(item['completed'], bool)):
+            return None
+        texts.append(item['text'])
+        done.append(item['completed'])
+    return tuple(texts), bytes(done)
+
+@dataclass(slots=True)
+class Card:
+    id: str
+    user_id: str
+    username: str
+    title: str
+    subtitle: str
+    texts: tuple
+    done: bytes
+    public: bool
+    deadline: object  # 타임스탬프(int) 또는 None
+    created_at: int
+    updated_at: int
+    rev: int = 0  # 마지막으로 바뀐 시점의 저장소 버전 (동기화용)
+    version: int = 1  # 카드를 수정할 때마다 1씩 증가 (수정 충돌 확인용)
+    extra: dict = None  # 알 수 없는 필드/비표준 할일 목록 (무손실 변환용)
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = {k: v for k, v in data.items() if k not in CARD_FIELDS}
+        card = cls(
+            id=data['id'],
+            user_id=sys.intern(data['user_id']),
+            username=sys.intern(data.get('username') or ''),
+            title=data.get('title', ''),
+            subtitle=data.get('subtitle', ''),
+            texts=(),
+            done=b'',
+            public=data.get('public', False),
+            deadline=data.get('deadline'),
+            created_at=data.get('createdAt'),
+            updated_at=data.get('updatedAt'),
+            rev=data.get('rev', 0),
+            version=data.get('version', 1),
+            extra=extra or None
+        )
+        card.set_contents(data.get('contents') or [])
+        return card
+
+    @property
+    def contents(self):
+        if self.extra and 'contents' in self.extra:
+            return self.extra['contents']
+        return [{'text': text, 'completed': bool(done)} for text, done in zip(self.texts, self.done)]
+
+    def set_contents(self, contents):
+        packed = _pack_contents(contents)
+        if self.extra:
+            self.extra.pop('contents', None)
+        if packed is None:
+            self.texts, self.done = (), b''
+            self.extra = dict(self.extra or {}, contents=contents)
+        else:
+            self.texts, self.done = packed
+        if not self.extra:
+            self.extra = None
+
+    def is_completed(self):
+        if self.extra and 'contents' in self.extra:
+            contents = self.extra['contents']
+            return bool(contents) and all(isinstance(item, dict) and item.get('completed', False) for item in contents)
+        return bool(self.done) and 0 not in self.done
+
+    def to_dict(self):
+        data = {
+            'id': self.id,
+            'user_id': self.user_id,
+            'username': self.username,
+            'title': self.title,
+            'subtitle': self.subtitle,
+            'contents': self.contents,
+            'public': self.public,
+            'deadline': self.deadline,
+            'createdAt': self.created_at,
+            'updatedAt': self.updated_at,
+            'rev': self.rev,
+            'version': self.version
+        }
+        if self.extra:
+            data.update((k, v) for k, v in self.extra.items() if k != 'contents')
+        return data
+
+    def to_row(self):
+        """스냅샷용 튜플 (필드 순서 그대로)"""
+        return (self.id, self.user_id, self.username, self.title, self.subtitle, self.texts, self.done,
+                self.public, self.deadline, self.created_at, self.updated_at, self.rev, self.version,
+                dict(self.extra) if self.extra else None)
+
+    @classmethod
+    def from_row(cls, row):
+        card = cls(*row)
+        card.user_id = sys.intern(card.user_id)
+        card.username = sys.intern(card.username)
+        return card
+
+class KeyedLocks:
+    """키(유저 id)마다 따로 잡는 락. 아무도 들고 있지 않은 락은 자동으로 정리된다."""
+
+    def __init__(self):
+        self._locks = weakref.WeakValueDictionary()
+        self._guard = Lock()
+
+    def __call__(self, key):
+        with self._guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = Lock()
+            return lock
+
+# 같은 유저의 카드 읽기-수정-저장은 이 락으로 직렬화하고, 다른 유저끼리는 서로 기다리지 않는다
+user_locks = KeyedLocks()
+
+class CardStoreLockedError(RuntimeError):
+    """다른 프로세스가 cards.lock을 잡고 있어서 카드를 쓸 수 없음"""
+
+class CardStore:
+    """cards.json을 Card 객체로 메모리에 들고 있는 저장소.
+    다른 프로세스가 파일을 바꾸면(mtime/크기 변경) 다음 접근 때 다시 읽는다.
+
+    카드가 추가/수정/삭제될 때마다 저장소 버전(version)이 1씩 올라가고,
+    카드의 rev에 그 버전이 기록된다. 삭제된 카드는 tombstones.json에
+    (rev, id, user_id)로 남겨서 클라이언트가 변경분만 받아갈 수 있게 한다.
+
+    변경은 메모리에 바로 반영하고, commit()은 write_behind_delay 동안 모인 변경을
+    백그라운드 스레드에서 한 번에 파일로 쓴다. 파일을 쓰는 동안에는 저장소 락을 잡지 않는다.
+
+    한 DATA_DIR의 카드는 한 프로세스만 쓸 수 있다. 처음 바꿀 때 cards.lock을 잡고 close()까지 놓지 않으며,
+    다른 프로세스가 이미 잡고 있으면 CardStoreLockedError를 낸다 (서로 자기 메모리로 파일을 덮어써서 변경이 사라지지 않도록).
+
+    snapshot_filename을 주면 write_snapshot()이 카드를 pickle로 남겨 두고,
+    다음에 읽을 때 cards.json의 mtime/크기가 스냅샷에 기록된 것과 같으면 JSON 대신 스냅샷을 읽는다."""
+
+    def __init__(self, data_dir, filename="cards.json", tombstone_filename="tombstones.json",
+                 snapshot_filename=None, lock_filename="cards.lock", tombstone_limit=10000, write_behind_delay=0.2):
+        self.data_dir = data_dir
+        self.filename = filename
+        self.tombstone_filename = tombstone_filename
+        self.snapshot_filename = snapshot_filename
+        self.lock_filename = lock_filename
+        self._writer = None  # 잡고 있는 cards.lock 파일
+        self.tombstone_limit = tombstone_limit
+        self.write_behind_delay = write_behind_delay
+        self._snapshot_stamp = None  # 스냅샷이 담고 있는 cards.json의 stamp
+        self._cards = {}  # id -> Card (삽입 순서 = 파일 순서)
+        self._tombstones = []  # [(rev, card_id, user_id)] rev 오름차순
+        self._tombstone_floor = 0  # 이 버전 이하의 삭제 기록은 잘려나갔음
+        self._tombstones_dirty = False
+        self._dirty = False  # 메모리에는 반영됐지만 아직 파일에 쓰지 않은 변경이 있음
+        self._version = 0
+        self._stamp = None
+        self._loaded = False  # 한 번이라도 읽었음 (cards.json이 없으면 _stamp는 None인 채로 빈 저장소가 된다)
+        self._lock = threading.RLock()
+        self._save_lock = Lock()  # 파일을 쓰는 스레드는 항상 하나
+        self._save_requested = threading.Event()
+        self._flusher = None
+        self._listeners = []  # 카드가 바뀔 때마다 호출 (캐시 무효화용)
+
+    @property
+    def path(self):
+        return os.path.join(self.data_dir, self.filename)
+
+    @property
+    def tombstone_path(self):
+        return os.path.join(self.data_dir, self.tombstone_filename)
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.data_dir, self.snapshot_filename)
+
+    @property
+    def lock_path(self):
+        return os.path.join(self.data_dir, self.lock_filename)
+
+    def _file_stamp(self):
+        return file_stamp(self.path)
+
+    def claim_writer(self):
+        """카드를 바꾸거나 쓰기 전에 호출: 이 프로세스가 cards.json을 쓰는 유일한 프로세스가 되게 한다."""
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is not None:
+                return
+            f = open(self.lock_path, "a+")
+            if not try_lock_file(f):
+                f.close()
+                raise CardStoreLockedError(f"다른 프로세스가 {self.data_dir}의 카드를 쓰고 있습니다. "
+                                   "한 DATA_DIR은 한 프로세스만 쓸 수 있습니다.")
+            self._writer = f
+
+    def _ensure_loaded(self):
+        stamp = self._file_stamp()
+        if self._loaded and stamp == self._stamp:
+            return
+        with self._lock:
+            stamp = self._file_stamp()  # 다른 스레드가 방금 저장했을 수 있으니 락 안에서 다시 확인
+            if self._loaded and stamp == self._stamp:
+                return
+            tombstones = load_json(self.tombstone_path) or {}
+            self._tombstones = [tuple(t) for t in tombstones.get('items', [])]
+            self._tombstone_floor = tombstones.get('floor', 0)
+            self._tombstones_dirty = False
+            if stamp is None:
+                self._cards = {}
+            else:
+                with gc_paused():
+                    cards = self._read_snapshot(stamp)
+                    if cards is None:
+                        cards = [Card.from_dict(c) for c in load_json(self.path) or []]
+                    self._cards = {c.id: c for c in cards}
+            self._version = max(
+                max((c.rev for c in self._cards.values()), default=0),
+                self._tombstones[-1][0] if self._tombstones else 0,
+                self._tombstone_floor
+            )
+            self._stamp = stamp
+            self._loaded = True
+            self._dirty = False
+            self._notify()
+        # cards.json이 없으면 빈 저장소로 두고 처음 바뀔 때 만든다.
+        # 읽기만 하는 프로세스(워밍업, 디버그 리로더의 감시 프로세스 등)가 cards.lock을 잡지 않게 여기서는 쓰지 않는다.
+
+    @property
+    def version(self):
+        self._ensure_loaded()
+        return self._version
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self):
+        for listener in self._listeners:
+            listener()
+
+    def _next_rev(self):
+        self._version += 1
+        self._notify()
+        return self._version
+
+    def all(self):
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._cards.values())
+
+    def get(self, card_id):
+        self._ensure_loaded()
+        return self._cards.get(card_id)
+
+    def __contains__(self, card_id):
+        return self.get(card_id) is not None
+
+    def add(self, card):
+        self.claim_writer()
+        self._ensure_loaded()  # 잠금을 잡기 전에 다른 프로세스가 저장한 내용을 먼저 반영
+        with self._lock:
+            card.rev = self._next_rev()
+            self._cards[card.id] = card
+            self._dirty = True
+
+    def touch(self, card):
+        """고친 카드(replace()로 만든 사본)를 같은 id의 카드 자리에 넣고 새 버전을 기록한다.
+        저장소에 든 카드 객체는 고치지 않고 통째로 바꾸므로, 저장/직렬화 중에 반쯤 고쳐진 카드가 보이지 않는다."""
+        self.claim_writer()
+        with self._lock:
+            card.rev = self._next_rev()
+            self._cards[card.id] = card
+            self._dirty = True
+
+    def remove(self, card_id):
+        self.claim_writer()
+        self._ensure_loaded()
+        with self._lock:
+            card = self._cards.pop(card_id, None)
+            if card is not None:
+                self._dirty = True
+                self._tombstones.append((self._next_rev(), card_id, card.user_id))
+                cut = len(self._tombstones) - self.tombstone_limit
+                if cut > 0:
+                    self._tombstone_floor = self._tombstones[cut - 1][0]
+                    del self._tombstones[:cut]
+                self._tombstones_dirty = True
+            return card
+
+    def changes_since(self, since):
+        """since 이후 바뀐 카드와 삭제된 카드를 (version, cards, [(id, user_id)], reset)으로 반환.
+        since가 너무 오래됐거나 알 수 없는 버전이면 reset=True와 함께 전체 카드를 돌려준다."""
+        self._ensure_loaded()
+        with self._lock:
+            version = self._version
+            if since <= 0 or since < self._tombstone_floor or since > version:
+                return version, list(self._cards.values()), [], True
+            changed = [c for c in self._cards.values() if c.rev > since]
+            deleted = [(card_id, user_id) for rev, card_id, user_id in self._tombstones if rev > since]
+            return version, changed, deleted, False
+
+    def save(self):
+        """지금 메모리 상태를 바로 파일에 쓴다."""
+        with self._save_lock:
+            self._write()
+
+    def _write(self):
+        # 목록만 복사해 두고 락을 푼 뒤 카드 하나씩 직렬화해서 써 내려간다.
+        # 쓰는 동안 바뀐 카드는 _dirty가 다시 켜지므로 다음 저장 때 반영된다.
+        self.claim_writer()
+        with self._lock:
+            cards = list(self._cards.values())
+            tombstones = {'floor': self._tombstone_floor, 'items': list(self._tombstones)} if self._tombstones_dirty else None
+            self._dirty = self._tombstones_dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write('[')
+                for i, card in enumerate(cards):
+                    f.write(',\n  ' if i else '\n  ')
+                    f.write(json.dumps(card.to_dict(), ensure_ascii=False, indent=2).replace('\n', '\n  '))
+                f.write('\n]' if cards else ']')
+            if tombstones is not None:
+                save_json(self.tombstone_path, tombstones)
+            with self._lock:
+                os.replace(tmp_path, self.path)
+                self._stamp = self._file_stamp()
+        except Exception:
+            # 저장하지 못한 변경이 다음 flush()/close() 때 다시 저장되도록 표시를 되돌린다
+            with self._lock:
+                self._dirty = True
+                if tombstones is not None:
+                    self._tombstones_dirty = True
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+    def flush(self):
+        """아직 저장되지 않은 변경이 있으면 파일에 쓴다 (진행 중인 저장이 있으면 끝날 때까지 기다린다)."""
+        with self._save_lock:
+            if self._dirty or self._tombstones_dirty:
+                self._write()
+
+    def commit(self):
+        """변경 저장을 예약한다. write_behind_delay가 0이면 바로 저장한다."""
+        if self.write_behind_delay <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name='card-store-flusher', daemon=True)
+                self._flusher.start()
+        self._save_requested.set()
+
+    def _flush_loop(self):
+        while True:
+            self._save_requested.wait()
+            time.sleep(self.write_behind_delay)  # 그동안 들어온 변경을 한 번에 저장
+            self._save_requested.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('카드 저장 실패')
+
+    def _snapshot_header(self, stamp):
+        # 카드 필드 구성이 바뀌면 예전 스냅샷은 자동으로 무시된다
+        return ('todolist-cards', 1, Card.__slots__, stamp)
+
+    def _read_snapshot(self, stamp):
+        """cards.json(stamp)과 같은 내용의 스냅샷이 있으면 Card 목록을, 없으면 None을 반환"""
+        if not self.snapshot_filename:
+            return None
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                # 헤더만 먼저 읽어서 오래된 스냅샷이면 본문은 읽지 않는다
+                if pickle.load(f) != self._snapshot_header(stamp):
+                    return None
+                rows = pickle.load(f)
+            cards = [Card.from_row(row) for row in rows]
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning('카드 스냅샷을 읽지 못해 %s에서 읽습니다.', self.filename, exc_info=True)
+            return None
+        self._snapshot_stamp = stamp
+        return cards
+
+    def write_snapshot(self):
+        """파일에 저장된 카드와 메모리가 같을 때 스냅샷을 남긴다. 이미 최신이면 아무것도 하지 않는다."""
+        if not self.snapshot_filename:
+            return False
+        with self._save_lock:  # 쓰는 동안 cards.json이 바뀌지 않게
+            with self._lock:
+                stamp = self._stamp
+                if self._dirty or stamp is None or stamp == self._snapshot_stamp:
+                    return False
+                rows = [card.to_row() for card in self._cards.values()]
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._snapshot_header(stamp), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+            self._snapshot_stamp = stamp
+        return True
+
+    def close(self):
+        """종료할 때 호출: 남은 변경을 저장하고 다음 시작을 위해 스냅샷을 남긴 뒤 cards.lock을 놓는다."""
+        self.flush()
+        self.write_snapshot()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+def _state():
+    return current_app.extensions['todolist']
+
+# 요청/CLI 명령 안에서 현재 앱의 저장소를 가리킨다 (앱마다 하나씩, create_app()에서 만든다)
+card_store = LocalProxy(lambda: _state().cards)
+user_store = LocalProxy(lambda: _state().users)
+
+# ---------------- 공개 카드 피드 캐시 ----------------
+class SingleFlight:
+    """같은 key로 동시에 들어온 계산을 하나로 합친다. 먼저 온 요청만 fn을 실행하고 나머지는 그 결과를 받는다."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}  # key -> {'done': Event, 'result': ..., 'error': ...}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+        try:
+            call['result'] = fn()
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result']
+
+class PublicFeedCache:
+    """공개 카드 목록을 저장소 버전마다 한 번만 JSON으로 직렬화해 두는 캐시.
+    카드를 주인별로 묶어서 이어 붙이고 주인별 바이트 위치(span)를 기록해 두므로,
+    '내 카드를 뺀 공개 카드 목록'은 다시 훑지 않고 앞뒤를 잘라 붙이기만 하면 된다.
+    카드가 바뀌면 저장소가 invalidate()를 불러 캐시를 비운다."""
+
+    def __init__(self, store):
+        self._store = store
+        self._entry = None  # (version, body, spans)
+        self._flight = SingleFlight()
+        store.add_listener(self.invalidate)
+
+    def invalidate(self):
+        self._entry = None
+
+    def _current(self):
+        version = self._store.version
+        entry = self._entry
+        if entry is not None and entry[0] == version:
+            return entry
+        entry = self._flight.do(version, lambda: self._build(version))
+        current = self._entry
+        if current is None or current[0] < entry[0]:
+            self._entry = entry
+        return entry
+
+    def _build(self, version):
+        groups = {}
+        for card in self._store.all():
+            if card.public:
+                groups.setdefault(card.user_id, []).append(json.dumps(card.to_dict(), ensure_ascii=False).encode('utf-8'))
+        body = bytearray(b'[')
+        spans = {}
+        for i, (user_id, parts) in enumerate(groups.items()):
+            start = len(body)
+            if i:
+                body += b','  # 앞 쉼표는 이 유저 구간에 포함
+            body += b','.join(parts)
+            spans[user_id] = (start, len(body))
+        body += b']'
+        if len(spans) > 1:
+            # 첫 유저 구간은 앞 쉼표가 없으니 뒤 쉼표를 포함시킨다
+            first = next(iter(spans))
+            spans[first] = (spans[first][0], spans[first][1] + 1)
+        return version, bytes(body), spans
+
+    def view_for(self, user_id):
+        """user_id의 카드를 뺀 공개 카드 JSON 배열을 (version, bytes)로 반환"""
+        version, body, spans = self._current()
+        span = spans.get(user_id)
+        if span is None:
+            return version, body
+        return version, body[:span[0]] + body[span[1]:]
+
+public_feed = LocalProxy(lambda: _state().public_feed)
+
+# ---------------- 아카이브 (완료된 오래된 카드) ----------------
+# 완료 후 오래된 카드는 gzip 압축된 NDJSON 파일로 옮기고,
+# 랭킹 계산에 필요한 유저별 완료 수는 archive_stats.json에 미리 집계해 둔다.
+ARCHIVE_FILE = "cards_archive.jsonl.gz"
+ARCHIVE_STATS_FILE = "archive_stats.json"
+_archive_lock = Lock()
+
+def get_archive_stats():
+    stats = load_json(data_path(ARCHIVE_STATS_FILE))
+    if stats is None:
+        stats = {'count': 0, 'users': {}}
+    return stats
+
+class _BoundedReader(io.RawIOBase):
+    """파일에서 limit 바이트까지만 읽는다. 읽는 도중에 아카이브 뒤에 덧붙는 gzip 멤버를 보지 않게 한다."""
+
+    def __init__(self, f, limit):
+        self._f = f
+        self._left = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._left <= 0:
+            return 0
+        n = self._f.readinto(memoryview(b)[:self._left])
+        self._left -= n
+        return n
+
+def _archive_snapshot():
+    """아카이브 통계와 그때의 아카이브 파일 크기를 함께 읽는다. (통계, 경로, 크기) 반환"""
+    with _archive_lock:
+        path = data_path(ARCHIVE_FILE)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        return get_archive_stats(), path, size
+
+def _iter_archive_lines(path, offset, size):
+    """아카이브의 offset(gzip 멤버 시작)부터 size까지의 카드를 읽는다"""
+    if offset >= size:
+        return
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        gz = gzip.GzipFile(fileobj=io.BufferedReader(_BoundedReader(raw, size - offset)), mode="rb")
+        with io.TextIOWrapper(gz, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def _iter_user_archive(path, size, chunks, skip):
+    """유저의 청크([offset, 개수])만 풀어서 앞의 skip개를 건너뛴 카드를 차례로 돌려준다"""
+    for offset, count in chunks:
+        if skip >= count:
+            skip -= count
+            continue
+        yield from itertools.islice(_iter_archive_lines(path, offset, size), skip, count)
+        skip = 0
+
+def iter_archived_cards():
+    _, path, size = _archive_snapshot()
+    yield from _iter_archive_lines(path, 0, size)
+
+def archive_cold_cards(now=None):
+    """완료 후 ARCHIVE_AFTER_DAYS 이상 수정되지 않은 카드를 아카이브로 옮기고 옮긴 개수를 반환"""
+    days = current_app.config['ARCHIVE_AFTER_DAYS']
+    if days <= 0:
+        return 0
+    now = now or int(time.time())
+    cutoff = now - days * 86400
+    is_cold = lambda c: c.is_completed() and (c.updated_at or now) <= cutoff
+    with _archive_lock:
+        candidates = [c for c in card_store.all() if is_cold(c)]
+        if not candidates:
+            return 0
+        # 아카이브에 쓰는 동안 주인이 카드를 고치지 못하게 해당 유저들의 락을 모두 잡는다.
+        # 다른 곳은 유저 락을 하나씩만 잡으므로 항상 같은 순서로 잡으면 교착되지 않는다.
+        with contextlib.ExitStack() as stack:
+            for user_id in sorted({c.user_id for c in candidates}):
+                stack.enter_context(user_locks(user_id))
+            cold = [c for c in candidates if card_store.get(c.id) is c and is_cold(c)]
+            if not cold:
+                return 0
+
+            # 아카이브와 통계를 먼저 쓰고, 둘 다 성공한 뒤에만 저장소에서 뺀다.
+            # 다른 프로세스가 카드를 쓰고 있어서 뺄 수 없다면 아카이브에 쓰기 전에 실패해야 중복되지 않는다.
+            card_store.claim_writer()
+            path = data_path(ARCHIVE_FILE)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            by_user = {}
+            for card in cold:
+                by_user.setdefault(card.user_id, []).append(card)
+            try:
+                # 여러 gzip 멤버를 이어 붙여도 하나의 스트림으로 읽히므로 유저마다 멤버를 하나씩 덧붙이고,
+                # 그 위치를 통계에 남겨 두어 페이지를 읽을 때 그 유저의 멤버만 풀게 한다
+                chunks = {}
+                with open(path, "ab") as raw:
+                    for user_id, user_cards in by_user.items():
+                        chunks[user_id] = [raw.tell(), len(user_cards)]
+                        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                            gz.write("".join(json.dumps(card.to_dict(), ensure_ascii=False) + "\n"
+                                             for card in user_cards).encode("utf-8"))
+
+                stats = get_archive_stats()
+                for card in cold:
+                    user_stats = stats['users'].setdefault(card.user_id, {'username': card.username, 'completedCount': 0})
+                    user_stats['username'] = card.username
+                    user_stats['completedCount'] += 1
+                for user_id, chunk in chunks.items():
+                    stats['users'][user_id].setdefault('chunks', []).append(chunk)
+                stats['count'] += len(cold)
+                save_json(data_path(ARCHIVE_STATS_FILE), stats)
+            except Exception:
+                # 쓰다 만 gzip 멤버가 남으면 아카이브 전체를 읽을 수 없게 되므로 잘라낸다
+                if os.path.exists(path):
+                    os.truncate(path, size)
+                raise
+
+            for card in cold:
+                card_store.remove(card.id)
+        card_store.commit()
+    return len(cold)
 
-def save_cards(cards):
-    save_json("cards.json", cards)
+def _archive_loop(app):
+    """ARCHIVE_CHECK_INTERVAL마다 백그라운드에서 아카이브를 돌린다. 요청 처리 중에는 돌지 않는다."""
+    state = app.extensions['todolist']
+    state.ready.wait()
+    while not state.shutting_down.is_set():
+        try:
+            with app.app_context():
+                if archive_cold_cards():
+                    _broadcast_cards_changed('any')
+        except Exception:
+            logger.exception('카드 아카이브에 실패했습니다.')
+        if state.shutting_down.wait(app.config['ARCHIVE_CHECK_INTERVAL']):
+            break
+
+@contextlib.contextmanager
+def _cli_card_writer(hint):
+    """CLI 명령이 카드를 쓰려는데 실행 중인 서버가 cards.lock을 잡고 있으면 트레이스백 대신 hint를 보여 준다"""
+    try:
+        yield
+    except CardStoreLockedError as e:
+        raise click.ClickException(f"{e} {hint}")
+
+@bp.before_app_request
+def _start_archiver():
+    """요청을 받는 프로세스에서만 아카이브 스레드를 띄운다.
+    flask CLI 명령도 create_app()을 거치므로 앱을 만들 때 띄우면 CLI 프로세스가 서버의 카드 락을 가져갈 수 있다."""
+    state = _state()
+    if state.archiver is not None or current_app.config['ARCHIVE_AFTER_DAYS'] <= 0:
+        return
+    with state.archiver_lock:
+        if state.archiver is None and not state.shutting_down.is_set():
+            app = current_app._get_current_object()
+            state.archiver = threading.Thread(target=_archive_loop, args=(app,), name='todolist-archiver', daemon=True)
+            state.archiver.start()
+
+@bp.cli.command('archive-cards')
+def archive_cards_command():
+    """완료된 오래된 카드를 아카이브로 옮긴다.
 
-def get_user_cards(user_id):
-    cards = get_cards()
-    return [c for c in cards if c['user_id'] == user_id]
+    서버가 같은 DATA_DIR의 카드를 쓰고 있으면 실행할 수 없다. 서버를 멈춘 뒤 실행하거나,
+    서버에 ARCHIVE_AFTER_DAYS를 설정해서 서버가 직접 아카이브하게 한다."""
+    with _cli_card_writer("서버를 멈춘 뒤 실행하거나 TODOLIST_ARCHIVE_AFTER_DAYS로 서버가 직접 아카이브하게 하세요."):
+        moved = archive_cold_cards()
+    click.echo(f"{moved}개의 카드를 아카이브했습니다.")
 
-@app.route('/api/cards', methods=['GET', 'POST'])
+@bp.route('/api/cards', methods=['GET', 'POST'])
 def cards():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
@@ -144,12 +946,11 @@ def cards():
     user_id = session['user_id']
     if request.method == 'GET':
         scope = request.args.get('scope', 'my')
-        cards = get_cards()
         if scope == 'my':
-            cards = [c for c in cards if c['user_id'] == user_id]
-        else:
-            cards = [c for c in cards if c['user_id'] != user_id and c.get('public')]
-        return jsonify(cards)
+            return jsonify([c.to_dict() for c in card_store.all() if c.user_id == user_id])
+        # 다른 사람들의 공개 카드는 모두에게 같으므로 캐시된 목록에서 내 카드만 잘라낸다
+        _, body = public_feed.view_for(user_id)
+        return Response(body, mimetype='application/json')
 
     # POST (새 카드 추가)
     data = request.get_json(silent=True) or {}
@@ -159,8 +960,9 @@ def cards():
     deadline = datetime_local_to_timestamp(data.get('deadline'))
     if not title:
         return jsonify({'error': '제목을 입력하세요.'}), 400
-    cards = get_cards()
-    new_card = {
+    if not isinstance(contents, list):
+        return jsonify({'error': '할일 목록 형식이 올바르지 않습니다.'}), 400
+    new_card = Card.from_dict({
         'id': str(uuid.uuid4()),
         'user_id': user_id,
         'username': session.get('username'),
@@ -171,83 +973,364 @@ def cards():
         'deadline': deadline,
         'createdAt': int(time.time()),
         'updatedAt': int(time.time())
-    }
-    cards.append(new_card)
-    save_cards(cards)
+    })
+    card_store.add(new_card)
+    card_store.commit()
     _broadcast_cards_changed('any')
-    return jsonify({'success': True, 'card': new_card}), 201
+    return jsonify({'success': True, 'card': new_card.to_dict()}), 201
 
-@app.route('/api/cards/<card_id>', methods=['PUT', 'DELETE'])
+@bp.route('/api/cards/<card_id>', methods=['PUT', 'DELETE'])
 def card_detail(card_id):
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
 
-    cards = get_cards()
     user_id = session['user_id']
-    card = next((c for c in cards if c['id'] == card_id and c['user_id'] == user_id), None)
-    if not card:
-        return jsonify({'error': '권한이 없거나 카드가 존재하지 않습니다.'}), 404
+    data = request.get_json(silent=True) or {}
+    # 클라이언트가 알고 있는 카드 버전 (본문의 version 또는 If-Match 헤더)
+    expected = data.get('version', request.headers.get('If-Match'))
+    if expected is not None:
+        try:
+            expected = int(str(expected).strip('"'))
+        except ValueError:
+            return jsonify({'error': '잘못된 버전입니다.'}), 400
+    if request.method == 'PUT' and 'contents' in data and not isinstance(data['contents'], list):
+        return jsonify({'error': '할일 목록 형식이 올바르지 않습니다.'}), 400
 
-    if request.method == 'DELETE':
-        cards = [c for c in cards if c['id'] != card_id]
-        save_cards(cards)
-        _broadcast_cards_changed('any')
-        return jsonify({'ok': True})
+    with user_locks(user_id):
+        card = card_store.get(card_id)
+        if not card or card.user_id != user_id:
+            return jsonify({'error': '권한이 없거나 카드가 존재하지 않습니다.'}), 404
+        if expected is not None and expected != card.version:
+            return jsonify({'error': '다른 곳에서 먼저 수정된 카드입니다. 최신 내용을 확인한 뒤 다시 시도하세요.',
+                            'card': card.to_dict()}), 409
 
-    data = request.get_json(silent=True) or {}
-    card.update({
-        'title': data.get('title', card['title']),
-        'subtitle': data.get('subtitle', card['subtitle']),
-        'contents': data.get('contents', card['contents']),
-        'public': bool(data.get('public', card['public'])),
-        'deadline': datetime_local_to_timestamp(data.get('deadline')),
-        'updatedAt': int(time.time())
-    })
-    save_cards(cards)
+        if request.method == 'DELETE':
+            card_store.remove(card_id)
+            card_store.commit()
+            result = {'ok': True}
+        else:
+            # 저장소의 카드를 그대로 고치면 저장/캐시 생성 중에 반쯤 바뀐 카드가 보이므로 사본을 만들어 바꿔 넣는다
+            card = replace(
+                card,
+                title=data.get('title', card.title),
+                subtitle=data.get('subtitle', card.subtitle),
+                public=bool(data.get('public', card.public)),
+                deadline=datetime_local_to_timestamp(data.get('deadline')),
+                updated_at=int(time.time()),
+                version=card.version + 1,
+                extra=dict(card.extra) if card.extra else None
+            )
+            if 'contents' in data:
+                card.set_contents(data['contents'])
+            card_store.touch(card)
+            card_store.commit()
+            result = card.to_dict()
     _broadcast_cards_changed('any')
-    return jsonify(card)
+    return jsonify(result)
 
-# ---------------- SSE (실시간 갱신) ----------------
-_subscribers = set()
-_subs_lock = Lock()
+@bp.route('/api/cards/changes')
+def card_changes():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
 
-def _event_stream():
+    user_id = session['user_id']
+    scope = request.args.get('scope', 'my')
+    since = request.args.get('since', 0, type=int)
+    version, changed, deleted, reset = _state().changes_flight.do(
+        (since, card_store.version), lambda: card_store.changes_since(since))
+    if reset and scope != 'my':
+        # 전체 목록을 다시 보내야 하면 공개 피드 캐시를 그대로 쓴다
+        version, body = public_feed.view_for(user_id)
+        head = json.dumps({'version': version, 'reset': True, 'deleted': []})[:-1].encode('utf-8')
+        return Response(head + b', "cards": ' + body + b'}', mimetype='application/json')
+    # 내 목록에는 내 카드의 삭제만 보낸다 (다른 사람의 비공개 카드 id가 새지 않도록).
+    # 공개 목록은 비공개로 바뀐 직후 삭제된 카드도 지워야 하므로 다른 사람의 삭제를 모두 보낸다.
+    if scope == 'my':
+        deleted = [card_id for card_id, owner in deleted if owner == user_id]
+    else:
+        deleted = [card_id for card_id, owner in deleted if owner != user_id]
+    cards = []
+    for card in changed:
+        if scope == 'my':
+            if card.user_id == user_id:
+                cards.append(card.to_dict())
+        elif card.user_id != user_id:
+            if card.public:
+                cards.append(card.to_dict())
+            elif not reset:
+                deleted.append(card.id)  # 비공개로 바뀐 카드는 다른 사람 화면에서 제거
+    return jsonify({'version': version, 'reset': reset, 'cards': cards, 'deleted': deleted})
+
+@bp.route('/api/cards/archive')
+def archived_cards():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+
+    user_id = session['user_id']
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = request.args.get('per_page', current_app.config['ARCHIVE_PAGE_SIZE'], type=int)
+    per_page = min(max(per_page, 1), 100)
+    stats, path, size = _archive_snapshot()
+    user_stats = stats['users'].get(user_id, {})
+    total = user_stats.get('completedCount', 0)
+
+    offset = (page - 1) * per_page
+    result = []
+    if offset < total:
+        archived = _iter_user_archive(path, size, user_stats.get('chunks', []), offset)
+        result = list(itertools.islice(archived, per_page))
+    return jsonify({
+        'cards': result,
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'hasMore': offset + len(result) < total
+    })
+
+# ---------------- 데이터 내보내기 / 가져오기 (NDJSON) ----------------
+# 카드/유저를 한 줄에 하나씩 JSON으로 스트리밍한다.
+# 가져오기는 IMPORT_CHUNK_SIZE개 단위로 검증 후 한 번씩만 파일에 저장한다.
+EXPORT_KINDS = ('cards', 'users')
+
+def iter_export_lines(kind):
+    if kind == 'users':
+        records = user_store.all()
+    else:
+        # 아카이브까지 포함해야 완전한 백업이 된다
+        records = itertools.chain((c.to_dict() for c in card_store.all()), iter_archived_cards())
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+def _validate_card_record(record, now):
+    if not isinstance(record, dict):
+        raise ValueError('객체가 아닙니다.')
+    for key in ('id', 'user_id', 'username', 'title'):
+        if not isinstance(record.get(key), str) or not record[key].strip():
+            raise ValueError(f"'{key}' 필드가 올바르지 않습니다.")
+    contents = record.get('contents', [])
+    if not isinstance(contents, list) or not all(
+            isinstance(item, dict) and isinstance(item.get('text', ''), str) for item in contents):
+        raise ValueError("'contents' 필드가 올바르지 않습니다.")
+    return {
+        'id': record['id'],
+        'user_id': record['user_id'],
+        'username': record['username'],
+        'title': record['title'].strip(),
+        'subtitle': str(record.get('subtitle') or '').strip(),
+        'contents': [{'text': item.get('text', ''), 'completed': bool(item.get('completed', False))} for item in contents],
+        'public': bool(record.get('public', False)),
+        'deadline': datetime_local_to_timestamp(record.get('deadline')),
+        'createdAt': int(record.get('createdAt') or now),
+        'updatedAt': int(record.get('updatedAt') or now)
+    }
+
+def _validate_user_record(record, now):
+    if not isinstance(record, dict):
+        raise ValueError('객체가 아닙니다.')
+    for key in ('id', 'username', 'password'):
+        if not isinstance(record.get(key), str) or not record[key].strip():
+            raise ValueError(f"'{key}' 필드가 올바르지 않습니다.")
+    if not 3 <= len(record['username']) <= 20:
+        raise ValueError('아이디는 3~20자여야 합니다.')
+    if len(record['password']) != 64:
+        raise ValueError('비밀번호 해시 형식이 올바르지 않습니다.')
+    return {'id': record['id'], 'username': record['username'], 'password': record['password']}
+
+def import_ndjson(kind, lines, chunk_size=None, progress=None):
+    """NDJSON 줄들을 chunk 단위로 검증/중복제거 후 저장하고 결과 요약을 반환"""
+    # 유저를 가져오는 동안 회원가입이 끼어들면 users.json을 서로 덮어쓰므로 막아 둔다
+    with (user_store.lock if kind == 'users' else contextlib.nullcontext()):
+        return _import_ndjson(kind, lines, chunk_size, progress)
+
+def _import_ndjson(kind, lines, chunk_size, progress):
+    chunk_size = chunk_size or current_app.config['IMPORT_CHUNK_SIZE']
+    started = time.time()
+    now = int(started)
+    if kind == 'users':
+        validate = _validate_user_record
+        users = user_store.all()
+        seen = {u['id'] for u in users} | {u['username'] for u in users}
+        keys_of = lambda r: (r['id'], r['username'])
+        add = users.append
+        save = lambda: user_store.save(users)
+    else:
+        validate = _validate_card_record
+        seen = {c.id for c in card_store.all()} | {c['id'] for c in iter_archived_cards()}
+        keys_of = lambda r: (r['id'],)
+        add = lambda r: card_store.add(Card.from_dict(r))
+        save = card_store.save
+
+    summary = {'kind': kind, 'imported': 0, 'duplicates': 0, 'invalid': 0, 'chunks': 0, 'errors': []}
+    pending = 0
+
+    def commit():
+        nonlocal pending
+        save()
+        summary['chunks'] += 1
+        pending = 0
+        if progress:
+            progress(summary, time.time() - started)
+
+    for line_no, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            record = validate(json.loads(line), now)
+        except (ValueError, TypeError) as e:  # json.JSONDecodeError는 ValueError의 하위 클래스
+            summary['invalid'] += 1
+            if len(summary['errors']) < 20:
+                summary['errors'].append({'line': line_no, 'error': str(e)})
+            continue
+        keys = keys_of(record)
+        if any(k in seen for k in keys):
+            summary['duplicates'] += 1
+            continue
+        seen.update(keys)
+        add(record)
+        summary['imported'] += 1
+        pending += 1
+        if pending >= chunk_size:
+            commit()
+    if pending:
+        commit()
+
+    elapsed = time.time() - started
+    summary['elapsed'] = round(elapsed, 3)
+    summary['recordsPerSecond'] = round(summary['imported'] / elapsed, 1) if elapsed > 0 else summary['imported']
+    return summary
+
+def _is_admin_request():
+    token = current_app.config.get('ADMIN_TOKEN')
+    given = request.headers.get('X-Admin-Token', '')
+    return bool(token) and secrets.compare_digest(given, token)
+
+@bp.route('/api/admin/export')
+def admin_export():
+    if not _is_admin_request():
+        return jsonify({'error': '관리자 권한이 필요합니다.'}), 403
+    kind = request.args.get('kind', 'cards')
+    if kind not in EXPORT_KINDS:
+        return jsonify({'error': '지원하지 않는 종류입니다.'}), 400
+    headers = {'Content-Disposition': f'attachment; filename={kind}.ndjson'}
+    return Response(stream_with_context(iter_export_lines(kind)), mimetype='application/x-ndjson', headers=headers)
+
+@bp.route('/api/admin/import', methods=['POST'])
+def admin_import():
+    if not _is_admin_request():
+        return jsonify({'error': '관리자 권한이 필요합니다.'}), 403
+    kind = request.args.get('kind', 'cards')
+    if kind not in EXPORT_KINDS:
+        return jsonify({'error': '지원하지 않는 종류입니다.'}), 400
+    chunk_size = request.args.get('chunk_size', type=int)
+    if chunk_size is not None:
+        chunk_size = max(chunk_size, 1)
+    summary = import_ndjson(kind, request.stream, chunk_size=chunk_size)
+    if kind == 'cards' and summary['imported']:
+        _broadcast_cards_changed('any')
+    return jsonify(summary)
+
+@bp.cli.command('export-data')
+@click.option('--kind', type=click.Choice(EXPORT_KINDS), default='cards')
+@click.option('--output', '-o', type=click.File('w', encoding='utf-8'), default='-')
+def export_data_command(kind, output):
+    """카드 또는 유저를 NDJSON으로 내보낸다."""
+    for line in iter_export_lines(kind):
+        output.write(line)
+
+@bp.cli.command('import-data')
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--kind', type=click.Choice(EXPORT_KINDS), default='cards')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=None)
+def import_data_command(source, kind, chunk_size):
+    """NDJSON 파일에서 카드 또는 유저를 가져온다.
+
+    서버가 같은 DATA_DIR의 카드를 쓰고 있으면 카드는 가져올 수 없다.
+    서버가 실행 중일 때는 /api/admin/import로 가져온다."""
+    def report(summary, elapsed):
+        click.echo(f"[{summary['chunks']}] {summary['imported']}개 저장, "
+                   f"중복 {summary['duplicates']}, 오류 {summary['invalid']} "
+                   f"({summary['imported'] / max(elapsed, 1e-9):.0f}개/초)", err=True)
+    with _cli_card_writer("서버가 실행 중이면 /api/admin/import로 가져오세요."):
+        summary = import_ndjson(kind, source, chunk_size=chunk_size, progress=report)
+    for error in summary['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(json.dumps({k: v for k, v in summary.items() if k != 'errors'}, ensure_ascii=False))
+
+# ---------------- SSE (실시간 갱신) ----------------
+def _event_stream(state):
     q = queue.Queue(maxsize=100)
-    with _subs_lock:
-        _subscribers.add(q)
+    with state.subs_lock:
+        state.subscribers.add(q)
     try:
         yield 'event: ping\ndata: keep-alive\n\n'
-        while True:
+        while not state.shutting_down.is_set():
             try:
                 msg = q.get(timeout=25)
+                if msg is None:  # 서버 종료: 스트림을 닫으면 클라이언트가 다른 워커로 재접속한다
+                    break
                 yield f"event: cards\ndata: {msg}\n\n"
             except queue.Empty:
                 yield 'event: ping\ndata: keep-alive\n\n'
     finally:
-        with _subs_lock:
-            _subscribers.discard(q)
+        with state.subs_lock:
+            state.subscribers.discard(q)
 
 def _broadcast_cards_changed(scope='any'):
+    state = _state()
     payload = json.dumps({'type': 'cards-changed', 'scope': scope, 'ts': int(time.time())})
-    with _subs_lock:
-        for q in list(_subscribers):
+    with state.subs_lock:
+        for q in list(state.subscribers):
             try:
                 q.put_nowait(payload)
             except Exception:
-                _subscribers.discard(q)
+                state.subscribers.discard(q)
+
+def _close_event_streams(state):
+    with state.subs_lock:
+        for q in list(state.subscribers):
+            try:
+                q.put_nowait(None)
+            except queue.Full:
+                pass  # 스트림 루프가 shutting_down을 확인하고 스스로 끝난다
 
-@app.route('/api/cards/stream')
+@bp.route('/api/cards/stream')
 def cards_stream():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
-    headers = {'Cache-Control': 'no-cache', 'Connection': 'keep-alive'}
-    return Response(stream_with_context(_event_stream()), mimetype='text/event-stream', headers=headers)
+    state = _state()
+    if state.shutting_down.is_set():
+        return jsonify({'error': 'Server is shutting down'}), 503
+    headers = {'Cache-Control': 'no-cache'}  # Connection은 hop-by-hop 헤더라 WSGI 앱이 보낼 수 없다 (PEP 3333)
+    return Response(stream_with_context(_event_stream(state)), mimetype='text/event-stream', headers=headers)
+
+# ---------------- 운영 (readiness / graceful shutdown) ----------------
+def shutdown(app):
+    """SIGTERM 등으로 종료할 때 호출: 새 요청을 받지 않도록 표시하고, SSE 스트림을 닫고, 남은 쓰기를 저장한다."""
+    state = app.extensions['todolist']
+    if state.shutting_down.is_set():
+        return
+    state.shutting_down.set()
+    _close_event_streams(state)
+    if state.archiver is not None:
+        state.archiver.join()  # 진행 중인 아카이브가 끝난 뒤에 저장소를 닫는다
+    state.cards.close()
+
+@bp.route('/healthz/ready')
+def readiness():
+    state = _state()
+    if state.shutting_down.is_set():
+        return jsonify({'status': 'shutting-down'}), 503
+    if not state.ready.is_set():
+        return jsonify({'status': 'warming-up'}), 503
+    return jsonify({'status': 'ready'})
 
 # ---------------- 페이지 ----------------
-@app.route('/home')
+@bp.route('/home')
 def home():
     if 'username' not in session:
-        return redirect(url_for('Login'))
+        return redirect(url_for('.Login'))
         
     modals = {
         'view_modal': {
@@ -265,10 +1348,10 @@ def home():
                          user_info={'username': session['username'], 'user_id': session['user_id']},
                          modals=modals)
 
-@app.route('/mylist')
+@bp.route('/mylist')
 def mylist():
     if 'username' not in session:
-        return redirect(url_for('Login'))
+        return redirect(url_for('.Login'))
         
     modals = {
         'add_modal': {
@@ -375,31 +1458,39 @@ def mylist():
                          user_info={'username': session['username'], 'user_id': session['user_id']},
                          modals=modals)
 
-@app.route('/ranking')
+@bp.route('/ranking')
 def ranking():
     if 'username' not in session:
-        return redirect(url_for('Login'))
+        return redirect(url_for('.Login'))
     return render_template('ranking.html', user_info={'username': session['username'], 'user_id': session['user_id']})
 
-@app.route('/api/ranking')
+@bp.route('/api/ranking')
 def get_ranking():
     if 'user_id' not in session:
         return jsonify({'error': 'Not logged in'}), 401
         
-    cards = get_cards()
     user_stats = {}
     
     # 각 유저별 완료된 카드 수 집계
-    for card in cards:
-        user_id = card['user_id']
+    for card in card_store.all():
+        user_id = card.user_id
         if not user_id in user_stats:
             user_stats[user_id] = {
-                'username': card['username'],
+                'username': card.username,
                 'completedCount': 0
             }
         # 카드의 모든 할일이 완료된 경우에만 카운트
-        if card['contents'] and all(item.get('completed', False) for item in card['contents']):
+        if card.is_completed():
             user_stats[user_id]['completedCount'] += 1
+
+    # 아카이브된 카드는 모두 완료 카드이므로 미리 집계된 수를 더한다
+    for user_id, archived in get_archive_stats()['users'].items():
+        if not user_id in user_stats:
+            user_stats[user_id] = {
+                'username': archived['username'],
+                'completedCount': 0
+            }
+        user_stats[user_id]['completedCount'] += archived['completedCount']
             
     # 리스트로 변환하고 완료 수에 따라 정렬
     ranking = [
@@ -413,5 +1504,64 @@ def get_ranking():
     ranking.sort(key=lambda x: (-x['completedCount'], x['username']))
     return jsonify(ranking)
 
+# ---------------- 앱 생성 ----------------
+class TodoListState:
+    """앱 하나가 쓰는 저장소/캐시/SSE 구독자/운영 상태. app.extensions['todolist']에 들어간다."""
+
+    def __init__(self, config):
+        data_dir = config['DATA_DIR']
+        self.cards = CardStore(
+            data_dir,
+            snapshot_filename="cards.snapshot" if config['CARD_SNAPSHOT'] else None,
+            tombstone_limit=config['SYNC_TOMBSTONE_LIMIT'],
+            write_behind_delay=config['WRITE_BEHIND_DELAY']
+        )
+        self.users = UserStore(data_dir)
+        self.public_feed = PublicFeedCache(self.cards)
+        # 같은 버전에서 같은 since로 몰려드는 변경분 요청(SSE 이벤트 직후 등)을 한 번의 계산으로 합친다
+        self.changes_flight = SingleFlight()
+        self.subscribers = set()
+        self.subs_lock = Lock()
+        self.archiver = None  # ARCHIVE_AFTER_DAYS > 0일 때 첫 요청에서 띄우는 백그라운드 아카이브 스레드
+        self.archiver_lock = Lock()
+        self.ready = threading.Event()  # 카드/유저를 다 읽었음
+        self.shutting_down = threading.Event()
+
+    def warm_up(self):
+        """카드/유저 파일을 미리 읽어 둔다. JSON에서 읽었다면 준비 완료를 알린 뒤 다음 시작을 위해 스냅샷을 남긴다."""
+        started = time.perf_counter()
+        try:
+            self.users.all()
+            self.cards.all()
+        except Exception:
+            logger.exception('카드/유저 데이터를 읽지 못했습니다.')
+            return
+        self.ready.set()
+        logger.info('데이터 준비 완료 (%.2f초)', time.perf_counter() - started)
+        try:
+            self.cards.write_snapshot()
+        except Exception:
+            logger.exception('카드 스냅샷을 쓰지 못했습니다.')
+
+def create_app(config=None):
+    """앱을 만든다. 카드/유저 파일은 백그라운드 스레드에서 읽고(WARM_UP),
+    다 읽기 전까지 /healthz/ready는 503을 돌려준다. 그 사이에 들어온 요청은 읽기가 끝날 때까지 기다린다."""
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.update(config or {})
+    os.makedirs(app.config['DATA_DIR'], exist_ok=True)
+    if not app.secret_key:
+        app.secret_key = load_or_create_secret_key(app.config['DATA_DIR'])
+
+    state = app.extensions['todolist'] = TodoListState(app.config)
+    app.register_blueprint(bp)
+    atexit.register(state.cards.close)
+    if app.config['WARM_UP']:
+        threading.Thread(target=state.warm_up, name='todolist-warm-up', daemon=True).start()
+    else:
+        state.ready.set()  # 처음 접근할 때 읽는다
+    return app
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    # 디버그 리로더의 감시 프로세스는 요청을 받지 않으므로 데이터를 미리 읽지 않는다 (실제 서버는 자식 프로세스)
+    create_app({'WARM_UP': os.environ.get('WERKZEUG_RUN_MAIN') == 'true'}).run(debug=True)
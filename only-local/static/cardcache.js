@@ -0,0 +1,346 @@
+// ===== Card Cache (IndexedDB 오프라인 캐시 + 증분 동기화) =====
+// - 카드 목록을 IndexedDB에 저장해 두고 페이지를 열면 저장된 카드부터 바로 그린다.
+// - /api/cards/changes?since=<version> 으로 바뀐 카드와 삭제된 카드 id만 받아서 반영한다.
+// - 오프라인에서 한 추가/수정/삭제는 outbox에 쌓아 두었다가 온라인이 되면 순서대로 다시 보낸다.
+//   다시 보낸 수정이 409(다른 곳에서 먼저 수정됨)로 거절되면 버리지 않고 충돌로 남겨 두고 사용자에게 묻는다.
+// IndexedDB를 쓸 수 없는 환경에서는 같은 동작을 메모리에서만 한다.
+const CardCache = (() => {
+  const DB_VERSION = 1;
+  const SCOPES = ['my', 'others'];
+  const userId = (window.userInfo && window.userInfo.userId) || 'anonymous';
+  const dbName = `todolist-cache-${userId}`;
+  const memory = { my: new Map(), others: new Map(), meta: new Map(), outbox: new Map() };
+  const syncChains = { my: Promise.resolve(), others: Promise.resolve() };
+  const replayListeners = [];
+  let memorySeq = 0;
+  let dbPromise = null;
+  let replaying = null;
+
+  // ----- IndexedDB helpers -----
+  function openDB() {
+    if (!dbPromise) {
+      dbPromise = new Promise(resolve => {
+        if (typeof indexedDB === 'undefined') return resolve(null);
+        const req = indexedDB.open(dbName, DB_VERSION);
+        req.onupgradeneeded = () => {
+          const db = req.result;
+          SCOPES.forEach(scope => db.createObjectStore(scope, { keyPath: 'id' }));
+          db.createObjectStore('meta');
+          db.createObjectStore('outbox', { keyPath: 'seq', autoIncrement: true });
+        };
+        req.onsuccess = () => {
+          // 다른 탭에서 로그아웃하며 DB를 지우려 하면 연결을 닫아서 막지 않는다
+          req.result.onversionchange = () => req.result.close();
+          resolve(req.result);
+        };
+        req.onerror = () => {
+          console.warn('IndexedDB를 열 수 없어 메모리 캐시를 사용합니다.', req.error);
+          resolve(null);
+        };
+      });
+    }
+    return dbPromise;
+  }
+
+  function reqToPromise(req) {
+    return new Promise((resolve, reject) => {
+      req.onsuccess = () => resolve(req.result);
+      req.onerror = () => reject(req.error);
+    });
+  }
+
+  // fn(stores) 안에서 한 트랜잭션으로 작업하고, 커밋된 뒤 fn의 결과를 돌려준다
+  async function withStores(names, mode, fn) {
+    const db = await openDB();
+    if (!db) return fn(null);
+    const tx = db.transaction(names, mode);
+    const done = new Promise((resolve, reject) => {
+      tx.oncomplete = resolve;
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+    });
+    const stores = {};
+    names.forEach(name => { stores[name] = tx.objectStore(name); });
+    const result = await fn(stores);
+    await done;
+    return result;
+  }
+
+  function sortCards(cards) {
+    return cards.sort((a, b) => (a.createdAt || 0) - (b.createdAt || 0) || String(a.id).localeCompare(String(b.id)));
+  }
+
+  // ----- 로컬 카드 -----
+  async function getAll(scope) {
+    const db = await openDB();
+    if (!db) return sortCards([...memory[scope].values()]);
+    const cards = await reqToPromise(db.transaction(scope).objectStore(scope).getAll());
+    return sortCards(cards);
+  }
+
+  async function getVersion(scope) {
+    const db = await openDB();
+    if (!db) return memory.meta.get(`version:${scope}`) || 0;
+    return (await reqToPromise(db.transaction('meta').objectStore('meta').get(`version:${scope}`))) || 0;
+  }
+
+  function putLocal(scope, card) {
+    return withStores([scope], 'readwrite', stores => {
+      if (!stores) memory[scope].set(card.id, card);
+      else stores[scope].put(card);
+    });
+  }
+
+  function deleteLocal(scope, id) {
+    return withStores([scope], 'readwrite', stores => {
+      if (!stores) memory[scope].delete(id);
+      else stores[scope].delete(id);
+    });
+  }
+
+  function applyChanges(scope, changes) {
+    return withStores([scope, 'meta'], 'readwrite', async stores => {
+      const key = `version:${scope}`;
+      const current = stores ? ((await reqToPromise(stores.meta.get(key))) || 0) : (memory.meta.get(key) || 0);
+      if (!changes.reset && changes.version < current) return; // 더 늦게 도착한 오래된 응답
+      if (!stores) {
+        if (changes.reset) memory[scope].clear();
+        changes.cards.forEach(card => memory[scope].set(card.id, card));
+        changes.deleted.forEach(id => memory[scope].delete(id));
+        memory.meta.set(key, changes.version);
+        return;
+      }
+      if (changes.reset) stores[scope].clear();
+      changes.cards.forEach(card => stores[scope].put(card));
+      changes.deleted.forEach(id => stores[scope].delete(id));
+      stores.meta.put(changes.version, key);
+    });
+  }
+
+  // ----- 네트워크 -----
+  // fetch 자체가 실패하면(오프라인 등) err.offline = true 로 표시한다
+  async function request(url, { method = 'GET', body, signal, timeout = 10000 } = {}) {
+    const controller = new AbortController();
+    const timeoutId = setTimeout(() => controller.abort(), timeout);
+    signal?.addEventListener('abort', () => controller.abort(), { once: true });
+    let res;
+    try {
+      res = await fetch(url, {
+        method,
+        credentials: 'same-origin',
+        headers: body ? { 'Content-Type': 'application/json' } : undefined,
+        body: body ? JSON.stringify(body) : undefined,
+        signal: controller.signal
+      });
+    } catch (err) {
+      if (err.name === 'AbortError' && signal?.aborted) throw err;
+      const wrapped = new Error(err.name === 'AbortError' ? '요청 시간이 초과되었습니다. 다시 시도해주세요.' : '서버에 연결할 수 없습니다.');
+      wrapped.offline = true;
+      throw wrapped;
+    } finally {
+      clearTimeout(timeoutId);
+    }
+    const ct = res.headers.get('content-type') || '';
+    const data = ct.includes('application/json') ? await res.json() : await res.text();
+    if (!res.ok) {
+      const err = new Error((data && (data.error || data.message)) || `HTTP ${res.status}`);
+      err.status = res.status;
+      err.data = data;
+      throw err;
+    }
+    return data;
+  }
+
+  // 변경분을 받아 로컬에 반영하고 정렬된 카드 목록을 돌려준다. 같은 scope의 동기화는 차례로 실행된다.
+  function sync(scope, { signal, timeout } = {}) {
+    const run = async () => {
+      if (scope === 'my') await replayOutbox();
+      const since = await getVersion(scope);
+      const changes = await request(`/api/cards/changes?scope=${scope}&since=${since}`, { signal, timeout });
+      await applyChanges(scope, changes);
+      return getAll(scope);
+    };
+    const result = syncChains[scope].then(run, run);
+    syncChains[scope] = result.catch(() => {});
+    return result;
+  }
+
+  // ----- 내 카드 변경 (오프라인이면 outbox에 저장) -----
+  async function enqueue(entry) {
+    await withStores(['outbox'], 'readwrite', stores => {
+      if (!stores) memory.outbox.set(++memorySeq, { ...entry, seq: memorySeq });
+      else stores.outbox.add(entry);
+    });
+  }
+
+  async function applyOptimistic({ method, url, body }) {
+    const now = Math.floor(Date.now() / 1000);
+    if (method === 'POST') {
+      const tempId = `local-${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 8)}`;
+      await putLocal('my', {
+        id: tempId,
+        user_id: userId,
+        username: window.userInfo?.username || '',
+        title: body.title,
+        subtitle: body.subtitle || '',
+        contents: body.contents || [],
+        public: !!body.public,
+        deadline: typeof body.deadline === 'number' ? body.deadline : null,
+        createdAt: now,
+        updatedAt: now,
+        pending: true
+      });
+      return tempId;
+    }
+    const id = url.split('/').pop();
+    if (method === 'DELETE') return deleteLocal('my', id);
+    const card = (await getAll('my')).find(c => c.id === id);
+    if (card) {
+      const deadline = typeof body.deadline === 'number' ? body.deadline : null;
+      // 서버도 수정할 때마다 version을 올리므로, 오프라인에서 연달아 수정해도 재전송 시 충돌하지 않도록 맞춰 둔다
+      await putLocal('my', { ...card, ...body, deadline, updatedAt: now, version: (card.version || 1) + 1, pending: true });
+    }
+  }
+
+  async function mutate({ method, url, body }) {
+    try {
+      const data = await request(url, { method, body });
+      if (method === 'DELETE') await deleteLocal('my', url.split('/').pop());
+      else await putLocal('my', data.card || data);
+      return { queued: false, data };
+    } catch (err) {
+      // 다른 곳에서 먼저 수정된 경우 서버의 최신 카드로 바꿔 둔다
+      if (err.status === 409 && err.data && err.data.card) await putLocal('my', err.data.card);
+      if (!err.offline) throw err;
+      const tempId = await applyOptimistic({ method, url, body });
+      await enqueue({ method, url, body, tempId: tempId || null });
+      return { queued: true };
+    }
+  }
+
+  async function getOutbox() {
+    const db = await openDB();
+    if (!db) return [...memory.outbox.values()];
+    return reqToPromise(db.transaction('outbox').objectStore('outbox').getAll());
+  }
+
+  function removeOutbox(seq) {
+    return withStores(['outbox'], 'readwrite', stores => {
+      if (!stores) memory.outbox.delete(seq);
+      else stores.outbox.delete(seq);
+    });
+  }
+
+  function putOutbox(entry) {
+    return withStores(['outbox'], 'readwrite', stores => {
+      if (!stores) memory.outbox.set(entry.seq, entry);
+      else stores.outbox.put(entry);
+    });
+  }
+
+  function rewriteOutbox(tempId, realId) {
+    return withStores(['outbox'], 'readwrite', async stores => {
+      const entries = stores ? await reqToPromise(stores.outbox.getAll()) : [...memory.outbox.values()];
+      entries.filter(e => e.url.endsWith(`/${tempId}`)).forEach(e => {
+        const updated = { ...e, url: e.url.replace(tempId, realId) };
+        if (!stores) memory.outbox.set(e.seq, updated);
+        else stores.outbox.put(updated);
+      });
+    });
+  }
+
+  // outbox의 변경을 순서대로 다시 보낸다. 연결이 안 되거나 서버 오류면 남은 항목은 다음 기회로 미룬다.
+  // 409로 거절된 수정은 entry.conflict에 서버 카드를 담아 남겨 두고, 같은 카드의 뒤이은 변경도 보내지 않는다.
+  function replayOutbox() {
+    if (replaying) return replaying;
+    replaying = (async () => {
+      let sent = 0;
+      const conflicts = [];
+      const idMap = new Map(); // 임시 id -> 서버에서 받은 id
+      const blocked = new Set(); // 충돌이 풀릴 때까지 보내지 않을 카드 url
+      for (const entry of await getOutbox()) {
+        const tempId = entry.url.split('/').pop();
+        const url = idMap.has(tempId) ? entry.url.replace(tempId, idMap.get(tempId)) : entry.url;
+        if (entry.conflict || blocked.has(url)) {
+          blocked.add(url);
+          continue;
+        }
+        try {
+          const data = await request(url, { method: entry.method, body: entry.body });
+          if (entry.method === 'POST' && entry.tempId) {
+            idMap.set(entry.tempId, data.card.id);
+            await deleteLocal('my', entry.tempId);
+            await putLocal('my', data.card);
+            await rewriteOutbox(entry.tempId, data.card.id); // 중간에 끊겨도 남은 항목이 새 id를 쓰도록
+          }
+        } catch (err) {
+          if (err.offline || err.status >= 500) break;
+          if (err.status === 409) {
+            const card = (err.data && err.data.card) || null;
+            if (card) await putLocal('my', card); // 화면에는 서버의 최신 내용을 보여 준다
+            const conflict = { ...entry, url, conflict: { card } };
+            await putOutbox(conflict);
+            conflicts.push(conflict);
+            blocked.add(url);
+            continue;
+          }
+          console.warn('반영할 수 없는 오프라인 변경을 버립니다:', entry, err);
+        }
+        await removeOutbox(entry.seq);
+        sent++;
+      }
+      return { sent, conflicts };
+    })().finally(() => { replaying = null; });
+    replaying.then(result => {
+      if (result.sent || result.conflicts.length) replayListeners.forEach(listener => listener(result));
+    }, () => {});
+    return replaying;
+  }
+
+  // 아직 정하지 않은 충돌 목록 (페이지를 다시 열었을 때도 남아 있다)
+  async function getConflicts() {
+    return (await getOutbox()).filter(entry => entry.conflict);
+  }
+
+  // keepMine이면 서버의 최신 버전 위에 내 변경을 다시 보내고, 아니면 내 변경(과 그 뒤의 같은 카드 변경)을 버린다
+  async function resolveConflict(seq, keepMine) {
+    const entries = await getOutbox();
+    const conflict = entries.find(entry => entry.seq === seq && entry.conflict);
+    if (!conflict) return;
+    const related = entries.filter(entry => entry.seq >= seq && entry.url === conflict.url);
+    let version = conflict.conflict.card ? conflict.conflict.card.version : null;
+    for (const entry of related) {
+      if (!keepMine) {
+        await removeOutbox(entry.seq);
+        continue;
+      }
+      const { conflict: _, ...rest } = entry;
+      if (version !== null && rest.body && 'version' in rest.body) {
+        rest.body = { ...rest.body, version: version++ }; // 서버는 수정할 때마다 version을 1씩 올린다
+      }
+      await putOutbox(rest);
+    }
+    return replayOutbox();
+  }
+
+  // 로그아웃할 때 이 유저의 캐시(보내지 못한 변경 포함)를 브라우저에서 지운다 (공용 PC에 비공개 카드가 남지 않도록)
+  async function clear() {
+    const db = await openDB();
+    if (db) db.close();
+    dbPromise = Promise.resolve(null);
+    Object.values(memory).forEach(map => map.clear());
+    if (typeof indexedDB === 'undefined') return;
+    await new Promise(resolve => {
+      const req = indexedDB.deleteDatabase(dbName);
+      req.onsuccess = req.onerror = req.onblocked = () => resolve();
+    });
+  }
+
+  function onReplay(listener) {
+    replayListeners.push(listener);
+  }
+
+  window.addEventListener('online', () => { replayOutbox(); });
+
+  return { getAll, sync, mutate, replayOutbox, onReplay, getConflicts, resolveConflict, clear };
+})();